@@ -15,7 +15,7 @@ import re
 
 from fastapi import WebSocket
 
-from db.database import get_connection, dicts_from_rows
+from db.database import get_connection, dicts_from_rows, get_client_rag
 from routes.ws import send_to
 
 
@@ -335,12 +335,7 @@ async def handle_chat_message(ws: WebSocket, message: dict):
             (client_id,),
         ).fetchall()
     )
-    rag_entries = dicts_from_rows(
-        conn.execute(
-            "SELECT * FROM client_rag WHERE client_id = ? ORDER BY created_at ASC",
-            (client_id,),
-        ).fetchall()
-    )
+    rag_entries = dicts_from_rows(get_client_rag(conn, client_id).fetchall())
     client["rag_context"] = [r["content"] for r in rag_entries]
 
     await send_to(ws, {"type": "thinking", "payload": {"step": "Analyzing your question..."}})
@@ -6,6 +6,7 @@ Never does math in plain text — always generates and runs code.
 from __future__ import annotations
 
 import json
+import asyncio
 import subprocess
 import tempfile
 import os
@@ -65,8 +66,9 @@ async def run_quant_agent(
     account_lines = []
     for acct in accounts:
         line = f"  {acct['type']} ({acct.get('label', '')}): balance ${acct['balance']:,.0f}"
-        if acct.get("contribution_room", 0) > 0:
-            line += f", contribution room ${acct['contribution_room']:,.0f}"
+        room = acct.get("contribution_room", 0)
+        if room > 0:
+            line += f", contribution room ${room:,.0f}"
         account_lines.append(line)
 
     doc_lines = []
@@ -110,7 +112,7 @@ RECENT CONVERSATION HISTORY:
 
         python_code = result.get("python_code", "")
         if python_code:
-            execution_output = _execute_python_safely(python_code)
+            execution_output = await asyncio.to_thread(_execute_python_safely, python_code)
             if execution_output:
                 result["details"] = result.get("details", "") + "\n\n--- Code Output ---\n" + execution_output
 
@@ -7,3 +7,6 @@ except ImportError:
     pass
 
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
+
+# Seconds between background shadow backtest scans
+SHADOW_BACKTEST_INTERVAL = int(os.getenv("SHADOW_BACKTEST_INTERVAL", "3600"))
@@ -1,34 +1,180 @@
 from __future__ import annotations
 
+import hashlib
 import os
-import sqlite3
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional
+
+import orjson
+
+try:
+    # Prefer the self-contained, more recent SQLite build when installed; the
+    # interpreter's bundled library can lag far behind.
+    import pysqlite3 as sqlite3
+except ImportError:
+    import sqlite3
+
+# Driver types for annotations in other modules, so they match whichever
+# sqlite3 implementation was imported above.
+Connection = sqlite3.Connection
+Row = sqlite3.Row
 
 _SRC_DIR = Path(__file__).parent
 SCHEMA_PATH = _SRC_DIR / "schema.sql"
+# Bump whenever schema.sql or the migrations in init_db change.
+SCHEMA_VERSION = 5
 
 _db_dir = os.environ.get("DB_DIR", str(_SRC_DIR))
 DB_PATH = Path(_db_dir) / "ws_shadow.db"
 
 
-def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(str(DB_PATH))
+POOL_SIZE = 8
+
+# One shared writer serialized by a lock, plus a pool of read-only connections.
+# WAL lets readers proceed while the writer holds its lock.
+_writer: Optional[sqlite3.Connection] = None
+_writer_lock = threading.Lock()
+_readers: queue.Queue[sqlite3.Connection] = queue.Queue(maxsize=POOL_SIZE)
+
+
+# Connection-level tuning, applied once when a connection is opened.
+_CONNECTION_PRAGMAS = """
+PRAGMA foreign_keys=ON;
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-64000;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA busy_timeout=5000;
+PRAGMA journal_size_limit=67108864;
+PRAGMA wal_autocheckpoint=1000;
+"""
+
+
+def _tune(conn: sqlite3.Connection) -> sqlite3.Connection:
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(_CONNECTION_PRAGMAS)
     return conn
 
 
+def get_connection() -> sqlite3.Connection:
+    # check_same_thread=False: pooled connections are handed between FastAPI's
+    # worker threads, but only ever used by one borrower at a time.
+    conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+    return _tune(conn)
+
+
+def _get_readonly_connection() -> sqlite3.Connection:
+    uri = f"{DB_PATH.resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    return _tune(conn)
+
+
+@contextmanager
+def get_reader() -> Iterator[sqlite3.Connection]:
+    """Borrow a pooled read-only connection."""
+    try:
+        conn = _readers.get_nowait()
+    except queue.Empty:
+        conn = _get_readonly_connection()
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            _readers.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+@contextmanager
+def get_writer() -> Iterator[sqlite3.Connection]:
+    """Run a write transaction on the shared writer connection.
+
+    BEGIN IMMEDIATE takes the write lock up front so the transaction can't fail
+    mid-way with SQLITE_BUSY; commits on success and rolls back on error,
+    including a failed COMMIT, so the shared connection never stays mid-transaction.
+    """
+    with _writer_lock:
+        conn = _get_writer_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+
+def _get_writer_connection() -> sqlite3.Connection:
+    # Caller must hold _writer_lock.
+    global _writer
+    if _writer is None:
+        _writer = get_connection()
+    return _writer
+
+
+def checkpoint_wal():
+    """Copy the WAL back into the database file and truncate it to zero bytes."""
+    with _writer_lock:
+        _get_writer_connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def read_connection() -> Iterator[sqlite3.Connection]:
+    """FastAPI dependency yielding a pooled read-only connection."""
+    with get_reader() as conn:
+        yield conn
+
+
+def incremental_vacuum(pages: int = 1000):
+    """Return up to `pages` free pages to the filesystem (auto_vacuum=INCREMENTAL)."""
+    with _writer_lock:
+        _get_writer_connection().execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+
+
+def close_connections():
+    """Close pooled connections, refreshing query planner stats first."""
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.execute("PRAGMA optimize")
+            _writer.close()
+            _writer = None
+    while True:
+        try:
+            _readers.get_nowait().close()
+        except queue.Empty:
+            break
+
+
+@lru_cache()
+def _schema_script() -> str:
+    return SCHEMA_PATH.read_text()
+
+
 def init_db():
     conn = get_connection()
-    with open(SCHEMA_PATH, "r") as f:
-        conn.executescript(f.read())
+    if conn.execute("SELECT user_version FROM pragma_user_version").fetchone()[0] == SCHEMA_VERSION:
+        conn.close()
+        return
+    # auto_vacuum only takes effect if set before the first table is created.
+    if conn.execute("SELECT page_count FROM pragma_page_count").fetchone()[0] == 0:
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    # journal_mode is persistent in the database file; only switch it once.
+    if conn.execute("SELECT journal_mode FROM pragma_journal_mode").fetchone()[0] != "wal":
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_schema_script())
     # Migration: add status column to chat_history if missing
     cols = [row[1] for row in conn.execute("PRAGMA table_info(chat_history)").fetchall()]
     if "status" not in cols:
         conn.execute("ALTER TABLE chat_history ADD COLUMN status TEXT NOT NULL DEFAULT 'pending'")
-        conn.commit()
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
     conn.close()
 
 
@@ -36,35 +182,81 @@ def dicts_from_rows(rows: List[sqlite3.Row]) -> List[dict]:
     return [dict(r) for r in rows]
 
 
+def rows_to_json(cursor: sqlite3.Cursor) -> bytes:
+    """Encode a cursor's rows as a JSON array, for routes that forward rows as-is.
+
+    Columns are paired positionally from cursor.description, which is cheaper
+    than building each dict through sqlite3.Row's key lookups.
+    """
+    columns = [d[0] for d in cursor.description]
+    return orjson.dumps([dict(zip(columns, r)) for r in cursor])
+
+
+_SQL_TABLE_VERSIONS = (
+    "SELECT version FROM table_versions "
+    "WHERE name = 'epoch' OR name IN (SELECT value FROM json_each(?)) ORDER BY name"
+)
+
+
+def data_etag(conn: sqlite3.Connection, tables: tuple[str, ...], *params) -> str:
+    """Build an ETag from the change counters of `tables` plus the request params.
+
+    Read the tag before the data it describes: a write landing in between then
+    yields a stale tag on fresh data, which only costs the client a refetch.
+    """
+    versions = conn.execute(_SQL_TABLE_VERSIONS, (orjson.dumps(tables),)).fetchall()
+    key = orjson.dumps([[v[0] for v in versions], tables, params])
+    return f'"{hashlib.blake2b(key, digest_size=8).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value covers `etag`.
+
+    If-None-Match uses weak comparison, so a W/ prefix (added by proxies that
+    compress the response) is ignored; the header may also list several tags.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
 # ── Client RAG helpers ───────────────────────────────────────────────
 
-def get_client_rag(client_id: str) -> List[dict]:
-    conn = get_connection()
-    rows = conn.execute(
-        "SELECT * FROM client_rag WHERE client_id = ? ORDER BY created_at ASC",
-        (client_id,),
-    ).fetchall()
-    conn.close()
-    return dicts_from_rows(rows)
+# sqlite3 caches prepared statements per connection, keyed by the SQL text.
+# The pooled connections live for the whole process, so these are prepared
+# once per connection rather than once per request.
+_SQL_GET_RAG = "SELECT * FROM client_rag WHERE client_id = ? ORDER BY created_at ASC"
+_SQL_ADD_RAG = (
+    "INSERT INTO client_rag (id, client_id, content, source, created_at) "
+    "VALUES (?,?,?,?,?) RETURNING *"
+)
+_SQL_DELETE_RAG = "DELETE FROM client_rag WHERE id = ?"
+
+
+def get_client_rag(conn: sqlite3.Connection, client_id: str) -> sqlite3.Cursor:
+    """Return a cursor over a client's RAG entries, oldest first."""
+    return conn.execute(_SQL_GET_RAG, (client_id,))
 
 
 def add_client_rag(client_id: str, content: str, source: str = "advisor") -> dict:
     import uuid
     entry_id = str(uuid.uuid4())
-    conn = get_connection()
-    conn.execute(
-        "INSERT INTO client_rag (id, client_id, content, source, created_at) VALUES (?,?,?,?,datetime('now'))",
-        (entry_id, client_id, content, source),
-    )
-    conn.commit()
-    row = conn.execute("SELECT * FROM client_rag WHERE id = ?", (entry_id,)).fetchone()
-    conn.close()
+    with get_writer() as conn:
+        row = conn.execute(
+            _SQL_ADD_RAG, (entry_id, client_id, content, source, datetime.now().isoformat()),
+        ).fetchone()
     return dict(row)
 
 
 def delete_client_rag(entry_id: str) -> bool:
-    conn = get_connection()
-    cur = conn.execute("DELETE FROM client_rag WHERE id = ?", (entry_id,))
-    conn.commit()
-    conn.close()
+    with get_writer() as conn:
+        cur = conn.execute(_SQL_DELETE_RAG, (entry_id,))
     return cur.rowcount > 0
@@ -77,9 +77,55 @@ CREATE TABLE IF NOT EXISTS client_rag (
     created_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_accounts_client ON accounts(client_id);
+CREATE INDEX IF NOT EXISTS idx_clients_name ON clients(name);
+CREATE INDEX IF NOT EXISTS idx_accounts_client_type ON accounts(client_id, type);
 CREATE INDEX IF NOT EXISTS idx_documents_client ON documents(client_id);
-CREATE INDEX IF NOT EXISTS idx_chat_history_client ON chat_history(client_id);
-CREATE INDEX IF NOT EXISTS idx_agent_tasks_client ON agent_tasks(client_id);
-CREATE INDEX IF NOT EXISTS idx_alerts_client ON alerts(client_id);
-CREATE INDEX IF NOT EXISTS idx_client_rag_client ON client_rag(client_id);
+CREATE INDEX IF NOT EXISTS idx_chat_history_client_created ON chat_history(client_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_agent_tasks_client_created ON agent_tasks(client_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_agent_tasks_status_created ON agent_tasks(status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_agent_tasks_created ON agent_tasks(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_alerts_client_status_type ON alerts(client_id, status, alert_type);
+CREATE INDEX IF NOT EXISTS idx_alerts_status_created ON alerts(status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_client_rag_client_created ON client_rag(client_id, created_at);
+
+-- Superseded by the composite indexes above
+DROP INDEX IF EXISTS idx_accounts_client;
+DROP INDEX IF EXISTS idx_chat_history_client;
+DROP INDEX IF EXISTS idx_agent_tasks_client;
+DROP INDEX IF EXISTS idx_alerts_client;
+DROP INDEX IF EXISTS idx_alerts_client_status;
+DROP INDEX IF EXISTS idx_client_rag_client;
+
+-- Per-table change counters bumped by triggers; routes hash them into ETags.
+-- The random 'epoch' row keeps tags from repeating if the database is recreated.
+CREATE TABLE IF NOT EXISTS table_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO table_versions (name, version) VALUES
+    ('epoch', abs(random())), ('clients', 0), ('accounts', 0), ('alerts', 0), ('chat_history', 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_clients_insert_version AFTER INSERT ON clients
+BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'clients'; END;
+CREATE TRIGGER IF NOT EXISTS trg_clients_update_version AFTER UPDATE ON clients
+BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'clients'; END;
+CREATE TRIGGER IF NOT EXISTS trg_clients_delete_version AFTER DELETE ON clients
+BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'clients'; END;
+CREATE TRIGGER IF NOT EXISTS trg_accounts_insert_version AFTER INSERT ON accounts
+BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'accounts'; END;
+CREATE TRIGGER IF NOT EXISTS trg_accounts_update_version AFTER UPDATE ON accounts
+BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'accounts'; END;
+CREATE TRIGGER IF NOT EXISTS trg_accounts_delete_version AFTER DELETE ON accounts
+BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'accounts'; END;
+CREATE TRIGGER IF NOT EXISTS trg_alerts_insert_version AFTER INSERT ON alerts
+BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'alerts'; END;
+CREATE TRIGGER IF NOT EXISTS trg_alerts_update_version AFTER UPDATE ON alerts
+BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'alerts'; END;
+CREATE TRIGGER IF NOT EXISTS trg_alerts_delete_version AFTER DELETE ON alerts
+BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'alerts'; END;
+CREATE TRIGGER IF NOT EXISTS trg_chat_history_insert_version AFTER INSERT ON chat_history
+BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'chat_history'; END;
+CREATE TRIGGER IF NOT EXISTS trg_chat_history_update_version AFTER UPDATE ON chat_history
+BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'chat_history'; END;
+CREATE TRIGGER IF NOT EXISTS trg_chat_history_delete_version AFTER DELETE ON chat_history
+BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'chat_history'; END;
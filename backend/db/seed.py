@@ -1,8 +1,10 @@
 """Seed the database with 8 diverse Canadian client profiles."""
 
-import json
 import uuid
 from datetime import datetime, timedelta
+
+import orjson
+
 from db.database import get_connection, init_db
 
 
@@ -10,6 +12,11 @@ def _id() -> str:
     return str(uuid.uuid4())
 
 
+def _json(value) -> str:
+    # SQLite stores these as TEXT, so decode orjson's bytes once here.
+    return orjson.dumps(value).decode()
+
+
 def seed():
     init_db()
     conn = get_connection()
@@ -21,17 +28,26 @@ def seed():
         conn.close()
         return
 
-    now = datetime.now().isoformat()
+    # Single clock read; chat history timestamps are offsets from it.
+    now_dt = datetime.now()
+    now = now_dt.isoformat()
+
+    def ago(**delta) -> str:
+        return (now_dt - timedelta(**delta)).isoformat()
+
+    # Rows are collected per table and written in one transaction at the end.
+    client_rows = []
+    account_rows = []
+    document_rows = []
+    chat_rows = []
+    alert_rows = []
 
     # ── Client 1: Sarah Chen ────────────────────────────────────────────
     sarah_id = _id()
-    cur.execute(
-        """INSERT INTO clients (id, name, email, phone, province, sin_last4, date_of_birth,
-           risk_profile, goals, marital_status, dependents, employment_income, employer, onboarded_at, advisor_notes)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    client_rows.append(
         (sarah_id, "Sarah Chen", "sarah.chen@email.com", "416-555-0123", "ON", "4821",
          "1994-06-15", "growth",
-         json.dumps(["Buy a cottage near Lake Muskoka", "Max FHSA before first home purchase", "Build long-term wealth"]),
+         _json(["Buy a cottage near Lake Muskoka", "Max FHSA before first home purchase", "Build long-term wealth"]),
          "single", 0, 145000, "Shopify", now,
          "Very engaged client. Asks detailed questions. Prefers email communication. First-time home buyer."),
     )
@@ -41,28 +57,20 @@ def seed():
         (_id(), sarah_id, "RRSP", "RRSP", 28000, 18500, now),
         (_id(), sarah_id, "checking", "TD Chequing", 23500, 0, now),
     ]
-    for a in sarah_accounts:
-        cur.execute("INSERT INTO accounts (id, client_id, type, label, balance, contribution_room, last_updated) VALUES (?,?,?,?,?,?,?)", a)
+    account_rows.extend(sarah_accounts)
 
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), sarah_id, "T4", "Employer: Shopify Inc. Employment income: $145,000. CPP contributions: $3,867. EI premiums: $1,049. Income tax deducted: $32,450.", 2024, now))
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), sarah_id, "NOA", "Total income: $145,000. Taxable income: $131,500. RRSP deduction limit: $18,500. TFSA room: $7,000. Federal tax: $22,180. Ontario tax: $10,270.", 2024, now))
+    document_rows.append((_id(), sarah_id, "T4", "Employer: Shopify Inc. Employment income: $145,000. CPP contributions: $3,867. EI premiums: $1,049. Income tax deducted: $32,450.", 2024, now))
+    document_rows.append((_id(), sarah_id, "NOA", "Total income: $145,000. Taxable income: $131,500. RRSP deduction limit: $18,500. TFSA room: $7,000. Federal tax: $22,180. Ontario tax: $10,270.", 2024, now))
 
-    cur.execute("INSERT INTO chat_history (id, client_id, role, content, created_at) VALUES (?,?,?,?,?)",
-                (_id(), sarah_id, "client", "I've been thinking about buying my first home. Should I keep putting money into my FHSA or start saving in my RRSP? I also have about $23K just sitting in my chequing account.", (datetime.now() - timedelta(days=2)).isoformat()))
-    cur.execute("INSERT INTO chat_history (id, client_id, role, content, created_at) VALUES (?,?,?,?,?)",
-                (_id(), sarah_id, "advisor", "Great question Sarah! Let me look into the numbers on FHSA vs RRSP for your situation. The FHSA is particularly interesting since you're a first-time buyer. I'll put together an analysis.", (datetime.now() - timedelta(days=2, hours=-1)).isoformat()))
+    chat_rows.append((_id(), sarah_id, "client", "I've been thinking about buying my first home. Should I keep putting money into my FHSA or start saving in my RRSP? I also have about $23K just sitting in my chequing account.", ago(days=2)))
+    chat_rows.append((_id(), sarah_id, "advisor", "Great question Sarah! Let me look into the numbers on FHSA vs RRSP for your situation. The FHSA is particularly interesting since you're a first-time buyer. I'll put together an analysis.", ago(days=2, hours=-1)))
 
     # ── Client 2: James Park ────────────────────────────────────────────
     james_id = _id()
-    cur.execute(
-        """INSERT INTO clients (id, name, email, phone, province, sin_last4, date_of_birth,
-           risk_profile, goals, marital_status, dependents, employment_income, employer, onboarded_at, advisor_notes)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    client_rows.append(
         (james_id, "James Park", "james.park@parkdental.ca", "604-555-0456", "BC", "7193",
          "1973-09-22", "balanced",
-         json.dumps(["Retire at 60", "Fund daughter's UBC tuition via RESP", "Income splitting with spouse", "Minimize corporate tax"]),
+         _json(["Retire at 60", "Fund daughter's UBC tuition via RESP", "Income splitting with spouse", "Minimize corporate tax"]),
          "married", 1, 310000, "Self-employed (Park Dental)", now,
          "Self-employed dentist. Incorporated. Spouse Lisa is a homemaker. Daughter Emily, age 16, starting UBC in 2 years."),
     )
@@ -73,26 +81,19 @@ def seed():
         (_id(), james_id, "corporate", "Park Dental Corp Investment", 220000, 0, now),
         (_id(), james_id, "checking", "Business Chequing", 45000, 0, now),
     ]
-    for a in james_accounts:
-        cur.execute("INSERT INTO accounts (id, client_id, type, label, balance, contribution_room, last_updated) VALUES (?,?,?,?,?,?,?)", a)
+    account_rows.extend(james_accounts)
 
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), james_id, "T4A", "Self-employment income: $310,000. Professional income from Park Dental Inc.", 2024, now))
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), james_id, "T2", "Corporate net income: $220,000. Small business deduction applied. Corporate tax payable: $27,500.", 2024, now))
+    document_rows.append((_id(), james_id, "T4A", "Self-employment income: $310,000. Professional income from Park Dental Inc.", 2024, now))
+    document_rows.append((_id(), james_id, "T2", "Corporate net income: $220,000. Small business deduction applied. Corporate tax payable: $27,500.", 2024, now))
 
-    cur.execute("INSERT INTO chat_history (id, client_id, role, content, created_at) VALUES (?,?,?,?,?)",
-                (_id(), james_id, "client", "Emily got her UBC acceptance letter! We need to start planning how to withdraw from the RESP. Also, I've been thinking about whether I should take a bigger salary or keep paying myself in dividends. Can we review the corporate structure?", (datetime.now() - timedelta(days=3)).isoformat()))
+    chat_rows.append((_id(), james_id, "client", "Emily got her UBC acceptance letter! We need to start planning how to withdraw from the RESP. Also, I've been thinking about whether I should take a bigger salary or keep paying myself in dividends. Can we review the corporate structure?", ago(days=3)))
 
     # ── Client 3: Priya Sharma ──────────────────────────────────────────
     priya_id = _id()
-    cur.execute(
-        """INSERT INTO clients (id, name, email, phone, province, sin_last4, date_of_birth,
-           risk_profile, goals, marital_status, dependents, employment_income, employer, onboarded_at, advisor_notes)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    client_rows.append(
         (priya_id, "Priya Sharma", "priya.sharma@email.com", "403-555-0789", "AB", "3456",
          "1997-03-10", "aggressive",
-         json.dumps(["Early retirement (FIRE)", "Aggressive savings rate (60%+)", "Considering rental property in Edmonton"]),
+         _json(["Early retirement (FIRE)", "Aggressive savings rate (60%+)", "Considering rental property in Edmonton"]),
          "single", 0, 118000, "Suncor Energy", now,
          "FIRE enthusiast. Very financially literate. Tracks every dollar. Prefers data-heavy analysis. No Alberta provincial tax advantage awareness needed - she knows."),
     )
@@ -102,26 +103,19 @@ def seed():
         (_id(), priya_id, "non_registered", "Non-Registered Investment", 67000, 0, now),
         (_id(), priya_id, "savings", "High-Interest Savings", 31000, 0, now),
     ]
-    for a in priya_accounts:
-        cur.execute("INSERT INTO accounts (id, client_id, type, label, balance, contribution_room, last_updated) VALUES (?,?,?,?,?,?,?)", a)
+    account_rows.extend(priya_accounts)
 
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), priya_id, "T4", "Employer: Suncor Energy. Employment income: $118,000. CPP: $3,867. EI: $1,049.", 2024, now))
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), priya_id, "T5", "Investment income: $4,200 (dividends: $2,800, interest: $1,400). Capital gains realized: $8,500.", 2024, now))
+    document_rows.append((_id(), priya_id, "T4", "Employer: Suncor Energy. Employment income: $118,000. CPP: $3,867. EI: $1,049.", 2024, now))
+    document_rows.append((_id(), priya_id, "T5", "Investment income: $4,200 (dividends: $2,800, interest: $1,400). Capital gains realized: $8,500.", 2024, now))
 
-    cur.execute("INSERT INTO chat_history (id, client_id, role, content, created_at) VALUES (?,?,?,?,?)",
-                (_id(), priya_id, "client", "I've been running the numbers and I think I can hit my FIRE target by 38 if I max out my RRSP this year. But I'm also looking at a rental property in Edmonton — would the down payment be better than the RRSP contribution? I need the math on this.", (datetime.now() - timedelta(days=4)).isoformat()))
+    chat_rows.append((_id(), priya_id, "client", "I've been running the numbers and I think I can hit my FIRE target by 38 if I max out my RRSP this year. But I'm also looking at a rental property in Edmonton — would the down payment be better than the RRSP contribution? I need the math on this.", ago(days=4)))
 
     # ── Client 4: Michel Tremblay ───────────────────────────────────────
     michel_id = _id()
-    cur.execute(
-        """INSERT INTO clients (id, name, email, phone, province, sin_last4, date_of_birth,
-           risk_profile, goals, marital_status, dependents, employment_income, employer, onboarded_at, advisor_notes)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    client_rows.append(
         (michel_id, "Michel Tremblay", "michel.tremblay@videotron.ca", "514-555-0321", "QC", "8834",
          "1958-11-03", "conservative",
-         json.dumps(["Minimize tax on RRIF withdrawals", "Maximize OAS/GIS", "Leave inheritance for 3 grandchildren"]),
+         _json(["Minimize tax on RRIF withdrawals", "Maximize OAS/GIS", "Leave inheritance for 3 grandchildren"]),
          "married", 0, 0, "Retired (formerly CSDM teacher)", now,
          "Retired teacher. Pension from RREGOP. Wife Claudette, age 65. 3 grandchildren. Prefers French but comfortable in English. Quebec tax rules apply (Revenu Québec)."),
     )
@@ -131,26 +125,19 @@ def seed():
         (_id(), michel_id, "non_registered", "Joint Non-Registered", 120000, 0, now),
         (_id(), michel_id, "LIF", "LIF (from LIRA)", 85000, 0, now),
     ]
-    for a in michel_accounts:
-        cur.execute("INSERT INTO accounts (id, client_id, type, label, balance, contribution_room, last_updated) VALUES (?,?,?,?,?,?,?)", a)
+    account_rows.extend(michel_accounts)
 
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), michel_id, "T4A", "RREGOP pension income: $52,000/year. Quebec pension plan.", 2024, now))
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), michel_id, "T4RIF", "RRIF withdrawals: $18,200 (minimum withdrawal for age 66). Withholding tax: $3,640.", 2024, now))
+    document_rows.append((_id(), michel_id, "T4A", "RREGOP pension income: $52,000/year. Quebec pension plan.", 2024, now))
+    document_rows.append((_id(), michel_id, "T4RIF", "RRIF withdrawals: $18,200 (minimum withdrawal for age 66). Withholding tax: $3,640.", 2024, now))
 
-    cur.execute("INSERT INTO chat_history (id, client_id, role, content, created_at) VALUES (?,?,?,?,?)",
-                (_id(), michel_id, "client", "Claudette and I want to make sure we're not paying more tax than we need to on the RRIF withdrawals. Also, we'd like to start gifting money to the grandchildren — is there a tax-smart way to do that? Maybe through the TFSA?", (datetime.now() - timedelta(days=6)).isoformat()))
+    chat_rows.append((_id(), michel_id, "client", "Claudette and I want to make sure we're not paying more tax than we need to on the RRIF withdrawals. Also, we'd like to start gifting money to the grandchildren — is there a tax-smart way to do that? Maybe through the TFSA?", ago(days=6)))
 
     # ── Client 5: Aisha Hassan ──────────────────────────────────────────
     aisha_id = _id()
-    cur.execute(
-        """INSERT INTO clients (id, name, email, phone, province, sin_last4, date_of_birth,
-           risk_profile, goals, marital_status, dependents, employment_income, employer, onboarded_at, advisor_notes)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    client_rows.append(
         (aisha_id, "Aisha Hassan", "aisha.hassan@email.com", "613-555-0654", "ON", "5567",
          "1986-08-20", "balanced",
-         json.dumps(["Pay off mortgage on Barrhaven home in 10 years", "Start RESP for newborn twins", "Build emergency fund"]),
+         _json(["Pay off mortgage on Barrhaven home in 10 years", "Start RESP for newborn twins", "Build emergency fund"]),
          "married", 2, 96000, "Canada Revenue Agency (CRA)", now,
          "Federal government employee. Spouse Yusuf works at DND, earns $88,000. Newborn twins born 3 months ago. Mortgage: $420,000 remaining at 5.2%. Just opened RESP."),
     )
@@ -160,24 +147,18 @@ def seed():
         (_id(), aisha_id, "RESP", "Twins RESP (family plan)", 0, 0, now),
         (_id(), aisha_id, "checking", "Joint Chequing", 18000, 0, now),
     ]
-    for a in aisha_accounts:
-        cur.execute("INSERT INTO accounts (id, client_id, type, label, balance, contribution_room, last_updated) VALUES (?,?,?,?,?,?,?)", a)
+    account_rows.extend(aisha_accounts)
 
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), aisha_id, "T4", "Employer: Canada Revenue Agency. Employment income: $96,000. Pension adjustment: $8,400.", 2024, now))
+    document_rows.append((_id(), aisha_id, "T4", "Employer: Canada Revenue Agency. Employment income: $96,000. Pension adjustment: $8,400.", 2024, now))
 
-    cur.execute("INSERT INTO chat_history (id, client_id, role, content, created_at) VALUES (?,?,?,?,?)",
-                (_id(), aisha_id, "client", "We just had twins! We opened an RESP but I'm not sure how much to contribute to get the maximum grant. Can you help?", (datetime.now() - timedelta(days=5)).isoformat()))
+    chat_rows.append((_id(), aisha_id, "client", "We just had twins! We opened an RESP but I'm not sure how much to contribute to get the maximum grant. Can you help?", ago(days=5)))
 
     # ── Client 6: David Okafor ──────────────────────────────────────────
     david_id = _id()
-    cur.execute(
-        """INSERT INTO clients (id, name, email, phone, province, sin_last4, date_of_birth,
-           risk_profile, goals, marital_status, dependents, employment_income, employer, onboarded_at, advisor_notes)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    client_rows.append(
         (david_id, "David Okafor", "david@okaforrestaurants.ca", "204-555-0987", "MB", "2290",
          "1980-04-12", "growth",
-         json.dumps(["Open 4th restaurant location", "Corporate tax optimization", "Spousal RRSP contributions", "Build passive income"]),
+         _json(["Open 4th restaurant location", "Corporate tax optimization", "Spousal RRSP contributions", "Build passive income"]),
          "married", 3, 195000, "Self-employed (Okafor Restaurants)", now,
          "Restaurant chain owner (3 locations in Winnipeg). Wife Ngozi handles bookkeeping. Corporate income $280K. Considering 4th location on Portage Ave. 3 kids ages 8, 11, 14."),
     )
@@ -188,26 +169,19 @@ def seed():
         (_id(), david_id, "corporate", "Okafor Restaurants Corp", 380000, 0, now),
         (_id(), david_id, "checking", "Business Operating", 92000, 0, now),
     ]
-    for a in david_accounts:
-        cur.execute("INSERT INTO accounts (id, client_id, type, label, balance, contribution_room, last_updated) VALUES (?,?,?,?,?,?,?)", a)
+    account_rows.extend(david_accounts)
 
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), david_id, "T2", "Okafor Restaurants Inc. Net corporate income: $280,000. Active business income eligible for SBD. Corporate tax: $35,000.", 2024, now))
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), david_id, "T5", "Eligible dividends paid: $85,000. Non-eligible dividends: $42,000.", 2024, now))
+    document_rows.append((_id(), david_id, "T2", "Okafor Restaurants Inc. Net corporate income: $280,000. Active business income eligible for SBD. Corporate tax: $35,000.", 2024, now))
+    document_rows.append((_id(), david_id, "T5", "Eligible dividends paid: $85,000. Non-eligible dividends: $42,000.", 2024, now))
 
-    cur.execute("INSERT INTO chat_history (id, client_id, role, content, created_at) VALUES (?,?,?,?,?)",
-                (_id(), david_id, "client", "I found a great location on Portage Ave for the 4th restaurant. The lease would be $8,500/month. I'm trying to figure out if I should finance this through the corporation or personally. Also, Ngozi and I want to start putting money aside for the kids' education — we've never opened an RESP.", (datetime.now() - timedelta(days=1)).isoformat()))
+    chat_rows.append((_id(), david_id, "client", "I found a great location on Portage Ave for the 4th restaurant. The lease would be $8,500/month. I'm trying to figure out if I should finance this through the corporation or personally. Also, Ngozi and I want to start putting money aside for the kids' education — we've never opened an RESP.", ago(days=1)))
 
     # ── Client 7: Emily Lawson ──────────────────────────────────────────
     emily_id = _id()
-    cur.execute(
-        """INSERT INTO clients (id, name, email, phone, province, sin_last4, date_of_birth,
-           risk_profile, goals, marital_status, dependents, employment_income, employer, onboarded_at, advisor_notes)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    client_rows.append(
         (emily_id, "Emily Lawson", "emily.lawson@email.com", "902-555-0135", "NS", "6712",
          "2001-12-05", "growth",
-         json.dumps(["Pay off $28K student loan (NSLSC)", "Build emergency fund", "Start investing for long-term"]),
+         _json(["Pay off $28K student loan (NSLSC)", "Build emergency fund", "Start investing for long-term"]),
          "single", 0, 62000, "Clearwater Seafoods", now,
          "New grad, first real job. $28K NSLSC student loan at 4.5%. No financial literacy background but very eager to learn. Needs basics explained clearly."),
     )
@@ -217,26 +191,19 @@ def seed():
         (_id(), emily_id, "checking", "Chequing", 3200, 0, now),
         (_id(), emily_id, "savings", "Savings", 1800, 0, now),
     ]
-    for a in emily_accounts:
-        cur.execute("INSERT INTO accounts (id, client_id, type, label, balance, contribution_room, last_updated) VALUES (?,?,?,?,?,?,?)", a)
+    account_rows.extend(emily_accounts)
 
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), emily_id, "T4", "Employer: Clearwater Seafoods. Employment income: $62,000. First full year of employment.", 2024, now))
+    document_rows.append((_id(), emily_id, "T4", "Employer: Clearwater Seafoods. Employment income: $62,000. First full year of employment.", 2024, now))
 
-    cur.execute("INSERT INTO chat_history (id, client_id, role, content, created_at) VALUES (?,?,?,?,?)",
-                (_id(), emily_id, "client", "I just started my first real job and I have no idea where to begin with saving. I have $28K in student loans. Should I pay that off first or start investing? What's the difference between a TFSA and RRSP?", (datetime.now() - timedelta(days=7)).isoformat()))
-    cur.execute("INSERT INTO chat_history (id, client_id, role, content, created_at) VALUES (?,?,?,?,?)",
-                (_id(), emily_id, "advisor", "Welcome Emily! These are exactly the right questions to be asking. Let me break it down simply. At your income level in Nova Scotia, there's actually a clear best path. Let me run the numbers for you.", (datetime.now() - timedelta(days=7, hours=-2)).isoformat()))
+    chat_rows.append((_id(), emily_id, "client", "I just started my first real job and I have no idea where to begin with saving. I have $28K in student loans. Should I pay that off first or start investing? What's the difference between a TFSA and RRSP?", ago(days=7)))
+    chat_rows.append((_id(), emily_id, "advisor", "Welcome Emily! These are exactly the right questions to be asking. Let me break it down simply. At your income level in Nova Scotia, there's actually a clear best path. Let me run the numbers for you.", ago(days=7, hours=-2)))
 
     # ── Client 8: Wei Zhang ─────────────────────────────────────────────
     wei_id = _id()
-    cur.execute(
-        """INSERT INTO clients (id, name, email, phone, province, sin_last4, date_of_birth,
-           risk_profile, goals, marital_status, dependents, employment_income, employer, onboarded_at, advisor_notes)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    client_rows.append(
         (wei_id, "Wei Zhang", "wei.zhang@importexport.ca", "604-555-0246", "BC", "9105",
          "1970-07-28", "balanced",
-         json.dumps(["Transition rental properties to passive investments", "Estate planning for 2 adult children in Toronto", "Lifetime capital gains exemption planning"]),
+         _json(["Transition rental properties to passive investments", "Estate planning for 2 adult children in Toronto", "Lifetime capital gains exemption planning"]),
          "married", 2, 175000, "Self-employed (Zhang Import/Export)", now,
          "Complex client. Real estate investor (3 rental properties in Richmond). Import/export business via holding company. 2 adult children (Kevin 28, Lisa 25) in Toronto. Estate planning priority. Wife Min, age 53."),
     )
@@ -247,16 +214,12 @@ def seed():
         (_id(), wei_id, "LIRA", "LIRA (former employer)", 65000, 0, now),
         (_id(), wei_id, "corporate", "Zhang Holdings Corp", 1200000, 0, now),
     ]
-    for a in wei_accounts:
-        cur.execute("INSERT INTO accounts (id, client_id, type, label, balance, contribution_room, last_updated) VALUES (?,?,?,?,?,?,?)", a)
+    account_rows.extend(wei_accounts)
 
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), wei_id, "T776", "Rental income: 3 properties in Richmond BC. Gross rental: $84,000. Net rental after expenses: $31,000.", 2024, now))
-    cur.execute("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)",
-                (_id(), wei_id, "T2", "Zhang Holdings Corp. Net income: $420,000. Passive investment income: $180,000. Active business income: $240,000.", 2024, now))
+    document_rows.append((_id(), wei_id, "T776", "Rental income: 3 properties in Richmond BC. Gross rental: $84,000. Net rental after expenses: $31,000.", 2024, now))
+    document_rows.append((_id(), wei_id, "T2", "Zhang Holdings Corp. Net income: $420,000. Passive investment income: $180,000. Active business income: $240,000.", 2024, now))
 
-    cur.execute("INSERT INTO chat_history (id, client_id, role, content, created_at) VALUES (?,?,?,?,?)",
-                (_id(), wei_id, "client", "Min and I are thinking about selling one of the Richmond properties — the market is good right now. But I'm worried about the capital gains tax. Kevin also just got married and we want to help him and Lisa with down payments. Can we look at the estate plan and figure out the most tax-efficient way to do all of this?", (datetime.now() - timedelta(days=2)).isoformat()))
+    chat_rows.append((_id(), wei_id, "client", "Min and I are thinking about selling one of the Richmond properties — the market is good right now. But I'm worried about the capital gains tax. Kevin also just got married and we want to help him and Lisa with down payments. Can we look at the estate plan and figure out the most tax-efficient way to do all of this?", ago(days=2)))
 
     # ── Client RAG entries (seeded from goals + extra context) ─────────
     rag_entries = [
@@ -327,37 +290,48 @@ def seed():
         (wei_id, "Complex client. Import/export business via holding company", "advisor"),
         (wei_id, "Wife Min, age 53. Estate planning priority", "advisor"),
     ]
-    for client_id, content, source in rag_entries:
-        cur.execute(
-            "INSERT INTO client_rag (id, client_id, content, source, created_at) VALUES (?,?,?,?,?)",
-            (_id(), client_id, content, source, now),
-        )
+    # Generator: executemany binds each row as it is produced, no intermediate list.
+    rag_rows = ((_id(), client_id, content, source, now) for client_id, content, source in rag_entries)
 
     # ── Proactive Alerts (pre-seeded) ───────────────────────────────────
-    cur.execute(
-        "INSERT INTO alerts (id, client_id, alert_type, title, description, drafted_action, status, created_at) VALUES (?,?,?,?,?,?,?,?)",
+    alert_rows.append(
         (_id(), sarah_id, "idle_cash", "Idle cash in chequing account",
          "Sarah has $23,500 sitting in her TD Chequing account. Her FHSA has $8,000 in contribution room and the RRSP deadline is approaching March 1. Consider moving funds to maximize tax-advantaged accounts.",
-         json.dumps({"type": "email_draft", "subject": "Quick thought on your savings",
+         _json({"type": "email_draft", "subject": "Quick thought on your savings",
                      "body": "Hi Sarah,\n\nI was reviewing your accounts and noticed you have about $23,500 in your chequing account. Given your goal of buying your first home, I think we should talk about topping up your FHSA (you have $8,000 in room) before the end of the year. This would give you both the tax deduction now and tax-free growth for your future home.\n\nWould you have 15 minutes this week to chat?\n\nBest,\nAlex"}),
-         "pending", now)),
+         "pending", now),
+    )
 
-    cur.execute(
-        "INSERT INTO alerts (id, client_id, alert_type, title, description, drafted_action, status, created_at) VALUES (?,?,?,?,?,?,?,?)",
+    alert_rows.append(
         (_id(), james_id, "portfolio_drift", "Portfolio drift: tech overweight",
          "James's portfolio has drifted to 42% tech allocation after the recent rally, above his 30% target for a balanced risk profile. Consider rebalancing into fixed income or Canadian dividend stocks.",
-         json.dumps({"type": "rebalance_suggestion", "current_tech_pct": 42, "target_tech_pct": 30}),
-         "pending", now)),
+         _json({"type": "rebalance_suggestion", "current_tech_pct": 42, "target_tech_pct": 30}),
+         "pending", now),
+    )
 
-    cur.execute(
-        "INSERT INTO alerts (id, client_id, alert_type, title, description, drafted_action, status, created_at) VALUES (?,?,?,?,?,?,?,?)",
+    alert_rows.append(
         (_id(), aisha_id, "cesg_optimization", "RESP: maximize CESG for twins",
          "Aisha's family RESP has $0. To maximize the Canada Education Savings Grant ($500/child/year), she should contribute $2,500 per child ($5,000 total) before December 31. That's $1,000 in free government money.",
-         json.dumps({"type": "email_draft", "subject": "Free money for the twins' education",
+         _json({"type": "email_draft", "subject": "Free money for the twins' education",
                      "body": "Hi Aisha,\n\nCongratulations again on the twins! I wanted to flag something time-sensitive: if you contribute $2,500 per child to the RESP before year-end, the government will match 20% — that's $1,000 in free grants through the CESG program.\n\nThe total contribution would be $5,000. Would you like me to set this up?\n\nBest,\nAlex"}),
-         "pending", now)),
+         "pending", now),
+    )
 
-    conn.commit()
+    with conn:
+        cur.executemany(
+            """INSERT INTO clients (id, name, email, phone, province, sin_last4, date_of_birth,
+               risk_profile, goals, marital_status, dependents, employment_income, employer, onboarded_at, advisor_notes)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            client_rows,
+        )
+        cur.executemany("INSERT INTO accounts (id, client_id, type, label, balance, contribution_room, last_updated) VALUES (?,?,?,?,?,?,?)", account_rows)
+        cur.executemany("INSERT INTO documents (id, client_id, type, content_text, tax_year, uploaded_at) VALUES (?,?,?,?,?,?)", document_rows)
+        cur.executemany("INSERT INTO chat_history (id, client_id, role, content, created_at) VALUES (?,?,?,?,?)", chat_rows)
+        cur.executemany("INSERT INTO client_rag (id, client_id, content, source, created_at) VALUES (?,?,?,?,?)", rag_rows)
+        cur.executemany(
+            "INSERT INTO alerts (id, client_id, alert_type, title, description, drafted_action, status, created_at) VALUES (?,?,?,?,?,?,?,?)",
+            alert_rows,
+        )
     conn.close()
 
 
@@ -1,26 +1,58 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from db.database import init_db
+from fastapi.responses import ORJSONResponse
+from config import SHADOW_BACKTEST_INTERVAL
+from db.database import checkpoint_wal, close_connections, incremental_vacuum, init_db
 from db.seed import seed
 from routes.clients import router as clients_router
 from routes.alerts import router as alerts_router
 from routes.agents import router as agents_router
 from routes.ws import router as ws_router
+from services.shadow_backtest import run_shadow_backtest
+# routes.ws imports the orchestrator lazily (it imports routes.ws back); load it
+# here so the first chat message doesn't pay for the import.
+import agents.orchestrator  # noqa: F401
+
+
+WAL_CHECKPOINT_INTERVAL = 300  # seconds
+
+
+async def _periodic_checkpoint():
+    """Keep the WAL and database files bounded for a long-running server."""
+    while True:
+        await asyncio.sleep(WAL_CHECKPOINT_INTERVAL)
+        try:
+            await asyncio.to_thread(incremental_vacuum)
+            await asyncio.to_thread(checkpoint_wal)
+        except Exception as e:
+            print(f"WAL checkpoint failed: {e}")
+
+
+async def _periodic_backtest():
+    """Run the shadow backtest at startup and then every SHADOW_BACKTEST_INTERVAL seconds."""
+    while True:
+        try:
+            await run_shadow_backtest()
+        except Exception as e:
+            print(f"Shadow backtest failed: {e}")
+        await asyncio.sleep(SHADOW_BACKTEST_INTERVAL)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
     seed()
-    # Run initial shadow backtest on startup
-    from services.shadow_backtest import run_shadow_backtest
-    import asyncio
-    asyncio.create_task(run_shadow_backtest())
+    backtest_task = asyncio.create_task(_periodic_backtest())
+    checkpoint_task = asyncio.create_task(_periodic_checkpoint())
     yield
+    backtest_task.cancel()
+    checkpoint_task.cancel()
+    close_connections()
 
 
-app = FastAPI(title="FinanceOS API", lifespan=lifespan)
+app = FastAPI(title="FinanceOS API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -8,3 +8,9 @@ class AgentActionRequest(BaseModel):
     action: str  # approved, edited, rejected
     note: str = ""
     edited_content: Optional[str] = None
+
+
+class AgentBulkActionRequest(BaseModel):
+    ids: list[str]
+    action: str  # approved, edited, rejected
+    note: str = ""
@@ -1,43 +1,70 @@
 from __future__ import annotations
-import json
-from fastapi import APIRouter
-from db.database import get_connection, dicts_from_rows
-from models.agent import AgentActionRequest
+import orjson
+from fastapi import APIRouter, Depends, Response
+from db.database import Connection, get_writer, read_connection
+from models.agent import AgentActionRequest, AgentBulkActionRequest
 
 router = APIRouter(prefix="/api/agents", tags=["agents"])
 
 
+# Rows are rendered to JSON inside SQLite so input_data/output_data are
+# embedded as objects without a Python json.loads round trip per row.
+_TASK_JSON_COLUMNS = """SELECT json_object(
+    'id', id, 'client_id', client_id, 'agent_type', agent_type, 'status', status,
+    'input_data', json(COALESCE(NULLIF(input_data, ''), '{}')),
+    'output_data', json(COALESCE(NULLIF(output_data, ''), '{}')),
+    'advisor_action', advisor_action, 'advisor_note', advisor_note,
+    'created_at', created_at, 'completed_at', completed_at
+) FROM agent_tasks"""
+
+_SQL_TASK_ACTION = "UPDATE agent_tasks SET advisor_action = ?, advisor_note = ? WHERE id = ?"
+_SQL_TASK_BULK_ACTION = (
+    "UPDATE agent_tasks SET advisor_action = ?, advisor_note = ? "
+    "WHERE id IN (SELECT value FROM json_each(?))"
+)
+
+
+# One statement per filter combination. Each is prepared once per pooled read
+# connection and then reused from sqlite3's statement cache, which the
+# long-lived connections keep across requests.
+_Q_TASKS_ALL = _TASK_JSON_COLUMNS + " ORDER BY created_at DESC LIMIT ?"
+_Q_TASKS_STATUS = _TASK_JSON_COLUMNS + " WHERE status = ? ORDER BY created_at DESC LIMIT ?"
+_Q_TASKS_CLIENT = _TASK_JSON_COLUMNS + " WHERE client_id = ? ORDER BY created_at DESC LIMIT ?"
+_Q_TASKS_BOTH = _TASK_JSON_COLUMNS + " WHERE status = ? AND client_id = ? ORDER BY created_at DESC LIMIT ?"
+
+
 @router.get("/tasks")
-def list_tasks(status: str = None, client_id: str = None, limit: int = 20) -> list[dict]:
+def list_tasks(
+    status: str = None,
+    client_id: str = None,
+    limit: int = 20,
+    conn: Connection = Depends(read_connection),
+) -> Response:
     limit = max(1, min(100, limit))
-    conn = get_connection()
-    query = "SELECT * FROM agent_tasks WHERE 1=1"
-    params = []
-    if status:
-        query += " AND status = ?"
-        params.append(status)
-    if client_id:
-        query += " AND client_id = ?"
-        params.append(client_id)
-    query += " ORDER BY created_at DESC LIMIT ?"
-    params.append(limit)
+    if status and client_id:
+        query, params = _Q_TASKS_BOTH, (status, client_id, limit)
+    elif status:
+        query, params = _Q_TASKS_STATUS, (status, limit)
+    elif client_id:
+        query, params = _Q_TASKS_CLIENT, (client_id, limit)
+    else:
+        query, params = _Q_TASKS_ALL, (limit,)
 
     rows = conn.execute(query, params).fetchall()
-    tasks = dicts_from_rows(rows)
-    for t in tasks:
-        t["input_data"] = json.loads(t["input_data"]) if t["input_data"] else {}
-        t["output_data"] = json.loads(t["output_data"]) if t["output_data"] else {}
-    conn.close()
-    return tasks
+    return Response("[" + ",".join(r[0] for r in rows) + "]", media_type="application/json")
 
 
 @router.post("/tasks/{task_id}/action")
 def act_on_task(task_id: str, req: AgentActionRequest) -> dict:
-    conn = get_connection()
-    conn.execute(
-        "UPDATE agent_tasks SET advisor_action = ?, advisor_note = ? WHERE id = ?",
-        (req.action, req.note, task_id),
-    )
-    conn.commit()
-    conn.close()
+    with get_writer() as conn:
+        conn.execute(_SQL_TASK_ACTION, (req.action, req.note, task_id))
     return {"status": "ok", "task_id": task_id, "action": req.action}
+
+
+@router.post("/tasks/bulk-action")
+def act_on_tasks(req: AgentBulkActionRequest) -> dict:
+    # json_each keeps this a single statement regardless of how many ids are
+    # sent, sidestepping SQLite's bound-parameter limit.
+    with get_writer() as conn:
+        cur = conn.execute(_SQL_TASK_BULK_ACTION, (req.action, req.note, orjson.dumps(req.ids).decode()))
+    return {"status": "ok", "updated": cur.rowcount, "action": req.action}
@@ -1,48 +1,63 @@
 from __future__ import annotations
-import json
-from fastapi import APIRouter, HTTPException
-from db.database import get_connection, dicts_from_rows
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from db.database import Connection, get_writer, read_connection, data_etag, etag_matches
 from models.alert import AlertActionRequest
+from services.shadow_backtest import run_shadow_backtest
 
 router = APIRouter(prefix="/api/alerts", tags=["alerts"])
 
 
 @router.post("/scan")
 async def trigger_backtest() -> dict:
-    from services.shadow_backtest import run_shadow_backtest
     new_alerts = await run_shadow_backtest()
     return {"new_alerts": len(new_alerts)}
 
 
+# Rendered to JSON inside SQLite, like list_tasks, so drafted_action is embedded
+# as an object by json1 instead of an orjson.loads per row in Python.
+# Alerts from one scan share created_at; rowid breaks the tie so pages don't
+# overlap, and still follows idx_alerts_status_created without a sort.
+_SQL_LIST_ALERTS = """SELECT json_object(
+    'id', a.id, 'client_id', a.client_id, 'alert_type', a.alert_type,
+    'title', a.title, 'description', a.description,
+    'drafted_action', json(COALESCE(NULLIF(a.drafted_action, ''), '{}')),
+    'status', a.status, 'created_at', a.created_at, 'client_name', c.name
+)
+FROM alerts a JOIN clients c ON a.client_id = c.id
+WHERE a.status = ?
+ORDER BY a.created_at DESC, a.rowid
+LIMIT ? OFFSET ?"""
+
+
 @router.get("")
-def list_alerts(status: str = "pending") -> list[dict]:
-    conn = get_connection()
-    rows = conn.execute(
-        """SELECT a.*, c.name as client_name
-           FROM alerts a JOIN clients c ON a.client_id = c.id
-           WHERE a.status = ?
-           ORDER BY a.created_at DESC""",
-        (status,),
-    ).fetchall()
-    alerts = dicts_from_rows(rows)
-    for alert in alerts:
-        alert["drafted_action"] = json.loads(alert["drafted_action"]) if alert["drafted_action"] else {}
-    conn.close()
-    return alerts
+def list_alerts(
+    request: Request,
+    status: str = "pending",
+    limit: int = 100,
+    offset: int = 0,
+    conn: Connection = Depends(read_connection),
+) -> Response:
+    limit = max(1, min(500, limit))
+    offset = max(0, offset)
+    etag = data_etag(conn, ("alerts", "clients"), status, limit, offset)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    rows = conn.execute(_SQL_LIST_ALERTS, (status, limit, offset)).fetchall()
+    return Response(
+        "[" + ",".join(r[0] for r in rows) + "]",
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
 
 
 @router.post("/{alert_id}/action")
 def act_on_alert(alert_id: str, req: AlertActionRequest) -> dict:
-    conn = get_connection()
-    row = conn.execute("SELECT * FROM alerts WHERE id = ?", (alert_id,)).fetchone()
-    if not row:
-        conn.close()
+    with get_writer() as conn:
+        cur = conn.execute(
+            "UPDATE alerts SET status = ? WHERE id = ?",
+            (req.action, alert_id),
+        )
+    if cur.rowcount == 0:
         raise HTTPException(status_code=404, detail="Alert not found")
-
-    conn.execute(
-        "UPDATE alerts SET status = ? WHERE id = ?",
-        (req.action, alert_id),
-    )
-    conn.commit()
-    conn.close()
     return {"status": "ok", "alert_id": alert_id, "action": req.action}
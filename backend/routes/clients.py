@@ -1,62 +1,84 @@
 from __future__ import annotations
-import json
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel
-from db.database import get_connection, dicts_from_rows, get_client_rag, add_client_rag, delete_client_rag
+from db.database import (
+    Connection, get_writer, dicts_from_rows, rows_to_json, read_connection, data_etag,
+    etag_matches,
+    get_client_rag, add_client_rag, delete_client_rag,
+)
 
 router = APIRouter(prefix="/api/clients", tags=["clients"])
 
 
 @router.get("")
-def list_clients() -> list[dict]:
-    conn = get_connection()
+def list_clients(request: Request, conn: Connection = Depends(read_connection)) -> Response:
+    etag = data_etag(conn, ("clients", "accounts", "chat_history"))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # Aggregate in derived tables before joining so accounts and chat rows
+    # don't multiply each other.
     rows = conn.execute(
-        "SELECT * FROM clients ORDER BY name"
+        """SELECT c.*,
+                  COALESCE(a.total, 0) AS total_portfolio,
+                  COALESCE(r.cnt, 0) AS pending_requests
+           FROM clients c
+           LEFT JOIN (
+               SELECT client_id, SUM(balance) AS total FROM accounts GROUP BY client_id
+           ) a ON a.client_id = c.id
+           LEFT JOIN (
+               SELECT client_id, COUNT(*) AS cnt FROM chat_history
+               WHERE role = 'client' AND status != 'completed'
+               GROUP BY client_id
+           ) r ON r.client_id = c.id
+           ORDER BY c.name"""
     ).fetchall()
     clients = dicts_from_rows(rows)
+    loads = orjson.loads
     for c in clients:
-        c["goals"] = json.loads(c["goals"]) if c["goals"] else []
-        accts = conn.execute(
-            "SELECT COALESCE(SUM(balance), 0) as total FROM accounts WHERE client_id = ?",
-            (c["id"],),
-        ).fetchone()
-        c["total_portfolio"] = accts["total"] if accts else 0
-        req_count = conn.execute(
-            "SELECT COUNT(*) as cnt FROM chat_history WHERE client_id = ? AND role = 'client' AND status != 'completed'",
-            (c["id"],),
-        ).fetchone()
-        c["pending_requests"] = req_count["cnt"] if req_count else 0
-    conn.close()
-    return clients
+        g = c["goals"]
+        c["goals"] = loads(g) if g else []
+    return Response(orjson.dumps(clients), media_type="application/json", headers={"ETag": etag})
+
+
+# Child collections for get_client, each folded into a JSON array inside SQLite
+# so the whole detail view comes back in one round trip.
+_SQL_CLIENT_DETAIL = """
+SELECT
+    (SELECT json_group_array(json_object(
+        'id', id, 'client_id', client_id, 'type', type, 'label', label, 'balance', balance,
+        'contribution_room', contribution_room, 'last_updated', last_updated))
+     FROM (SELECT * FROM accounts WHERE client_id = :id ORDER BY type)),
+    (SELECT json_group_array(json_object(
+        'id', id, 'client_id', client_id, 'type', type, 'content_text', content_text,
+        'tax_year', tax_year, 'file_path', file_path, 'uploaded_at', uploaded_at))
+     FROM (SELECT * FROM documents WHERE client_id = :id ORDER BY tax_year DESC)),
+    (SELECT json_group_array(json_object(
+        'id', id, 'client_id', client_id, 'role', role, 'content', content,
+        'status', status, 'created_at', created_at))
+     FROM (SELECT * FROM chat_history WHERE client_id = :id ORDER BY created_at ASC)),
+    (SELECT json_group_array(json_object(
+        'id', id, 'client_id', client_id, 'content', content, 'source', source,
+        'created_at', created_at))
+     FROM (SELECT * FROM client_rag WHERE client_id = :id ORDER BY created_at ASC))
+"""
 
 
 @router.get("/{client_id}")
-def get_client(client_id: str) -> dict:
-    conn = get_connection()
+def get_client(client_id: str, conn: Connection = Depends(read_connection)) -> dict:
     row = conn.execute("SELECT * FROM clients WHERE id = ?", (client_id,)).fetchone()
     if not row:
-        conn.close()
         raise HTTPException(status_code=404, detail="Client not found")
 
     client = dict(row)
-    client["goals"] = json.loads(client["goals"]) if client["goals"] else []
+    client["goals"] = orjson.loads(client["goals"]) if client["goals"] else []
 
-    accounts = dicts_from_rows(
-        conn.execute("SELECT * FROM accounts WHERE client_id = ? ORDER BY type", (client_id,)).fetchall()
-    )
-    documents = dicts_from_rows(
-        conn.execute("SELECT * FROM documents WHERE client_id = ? ORDER BY tax_year DESC", (client_id,)).fetchall()
-    )
-    chat_history = dicts_from_rows(
-        conn.execute("SELECT * FROM chat_history WHERE client_id = ? ORDER BY created_at ASC", (client_id,)).fetchall()
+    accounts, documents, chat_history, rag_entries = map(
+        orjson.loads, conn.execute(_SQL_CLIENT_DETAIL, {"id": client_id}).fetchone()
     )
     total = sum(a["balance"] for a in accounts)
 
-    rag_entries = dicts_from_rows(
-        conn.execute("SELECT * FROM client_rag WHERE client_id = ? ORDER BY created_at ASC", (client_id,)).fetchall()
-    )
-
-    conn.close()
     return {
         "client": client,
         "accounts": accounts,
@@ -68,47 +90,54 @@ def get_client(client_id: str) -> dict:
 
 
 @router.get("/{client_id}/accounts")
-def get_accounts(client_id: str) -> list[dict]:
-    conn = get_connection()
-    rows = conn.execute(
+def get_accounts(client_id: str, conn: Connection = Depends(read_connection)) -> Response:
+    cur = conn.execute(
         "SELECT * FROM accounts WHERE client_id = ? ORDER BY type", (client_id,)
-    ).fetchall()
-    conn.close()
-    return dicts_from_rows(rows)
+    )
+    return Response(rows_to_json(cur), media_type="application/json")
 
 
 @router.get("/{client_id}/chat")
-def get_chat_history(client_id: str) -> list[dict]:
-    conn = get_connection()
-    rows = conn.execute(
-        "SELECT * FROM chat_history WHERE client_id = ? ORDER BY created_at ASC",
-        (client_id,),
-    ).fetchall()
-    conn.close()
-    return dicts_from_rows(rows)
+def get_chat_history(
+    client_id: str,
+    request: Request,
+    limit: int = 100,
+    offset: int = 0,
+    conn: Connection = Depends(read_connection),
+) -> Response:
+    limit = max(1, min(500, limit))
+    offset = max(0, offset)
+    etag = data_etag(conn, ("chat_history",), client_id, limit, offset)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    # Pages count back from the newest message; each page is still oldest-first.
+    cur = conn.execute(
+        """SELECT * FROM (
+               SELECT * FROM chat_history WHERE client_id = ?
+               ORDER BY created_at DESC LIMIT ? OFFSET ?
+           ) ORDER BY created_at ASC""",
+        (client_id, limit, offset),
+    )
+    return Response(rows_to_json(cur), media_type="application/json", headers={"ETag": etag})
 
 
 @router.delete("/{client_id}/chat")
 def clear_chat_history(client_id: str) -> dict:
-    conn = get_connection()
-    conn.execute(
-        "DELETE FROM chat_history WHERE client_id = ? AND role != 'client'",
-        (client_id,),
-    )
-    conn.commit()
-    conn.close()
+    with get_writer() as conn:
+        conn.execute(
+            "DELETE FROM chat_history WHERE client_id = ? AND role != 'client'",
+            (client_id,),
+        )
     return {"status": "cleared"}
 
 
 @router.patch("/{client_id}/requests/{message_id}")
 def complete_client_request(client_id: str, message_id: str) -> dict:
-    conn = get_connection()
-    cur = conn.execute(
-        "UPDATE chat_history SET status = 'completed' WHERE id = ? AND client_id = ? AND role = 'client'",
-        (message_id, client_id),
-    )
-    conn.commit()
-    conn.close()
+    with get_writer() as conn:
+        cur = conn.execute(
+            "UPDATE chat_history SET status = 'completed' WHERE id = ? AND client_id = ? AND role = 'client'",
+            (message_id, client_id),
+        )
     if cur.rowcount == 0:
         raise HTTPException(status_code=404, detail="Client request not found")
     return {"status": "completed"}
@@ -119,8 +148,8 @@ class RagEntryRequest(BaseModel):
 
 
 @router.get("/{client_id}/rag")
-def list_client_rag(client_id: str) -> list[dict]:
-    return get_client_rag(client_id)
+def list_client_rag(client_id: str, conn: Connection = Depends(read_connection)) -> Response:
+    return Response(rows_to_json(get_client_rag(conn, client_id)), media_type="application/json")
 
 
 @router.post("/{client_id}/rag")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-import json
 import asyncio
+import orjson
 from typing import Set
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
@@ -16,7 +16,7 @@ VALID_TYPES = {"ping", "chat_message"}
 async def send_to(ws: WebSocket, message: dict):
     """Send a message to a specific WebSocket client."""
     try:
-        await ws.send_json(message)
+        await ws.send_bytes(orjson.dumps(message))
     except Exception:
         active_connections.discard(ws)
 
@@ -37,8 +37,8 @@ async def websocket_endpoint(ws: WebSocket):
                 continue
 
             try:
-                message = json.loads(data)
-            except (json.JSONDecodeError, ValueError):
+                message = orjson.loads(data)
+            except orjson.JSONDecodeError:
                 await send_to(ws, {
                     "type": "error",
                     "payload": {"message": "Invalid JSON"},
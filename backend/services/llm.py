@@ -5,20 +5,33 @@ Sonnet 5 handles substantive agent work and user-facing output.
 """
 from __future__ import annotations
 
-import json
+import re
 import asyncio
 from functools import lru_cache
 
+import orjson
+
 from config import ANTHROPIC_API_KEY
 
 MODEL_HAIKU = "claude-haiku-4-5-20251001"
 MODEL_SONNET = "claude-sonnet-5"
 
+# Outermost {...} span; markdown fences and any prose around the object fall
+# outside it, so one search replaces separate fence and brace scans.
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
 
 @lru_cache()
 def _get_anthropic_client():
-    from anthropic import Anthropic
-    return Anthropic(api_key=ANTHROPIC_API_KEY)
+    import httpx
+    from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+    # One pooled HTTP/2 client for every call, so concurrent agent requests
+    # multiplex over kept-alive connections instead of redoing TLS handshakes.
+    http_client = DefaultAsyncHttpxClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    )
+    return AsyncAnthropic(api_key=ANTHROPIC_API_KEY, http_client=http_client)
 
 
 def _extract_text(response) -> str:
@@ -29,28 +42,32 @@ def _extract_text(response) -> str:
     """
     parts = []
     for block in response.content:
-        block_type = getattr(block, "type", None)
-        if block_type == "text" or (block_type is None and hasattr(block, "text")):
-            parts.append(block.text)
-        elif isinstance(block, dict) and block.get("type", "text") == "text" and "text" in block:
-            parts.append(block["text"])
+        if isinstance(block, dict):
+            if block.get("type", "text") == "text" and "text" in block:
+                parts.append(block["text"])
+            continue
+        text = getattr(block, "text", None)
+        if text is not None and getattr(block, "type", None) in ("text", None):
+            parts.append(text)
     return "\n".join(parts)
 
 
 def _parse_json(raw: str) -> dict:
-    """Strip markdown fences if present and parse JSON."""
+    """Extract the JSON object from an LLM response and parse it."""
     text = raw.strip()
     if not text:
         raise ValueError("Empty response from LLM — no JSON to parse")
-    if text.startswith("```"):
-        first_newline = text.index("\n")
-        last_fence = text.rfind("```")
-        text = text[first_newline + 1:last_fence].strip()
-    start = text.find("{")
-    end = text.rfind("}")
-    if start != -1 and end != -1 and end > start:
-        text = text[start:end + 1]
-    return json.loads(text)
+    # Bare JSON is the common case; only search for the object when the model
+    # wrapped it in fences or prose.
+    if text[0] == "{":
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    match = _JSON_OBJECT_RE.search(text)
+    if match is None:
+        raise ValueError("No JSON object found in LLM response")
+    return orjson.loads(match.group())
 
 
 def _sonnet_request_kwargs(model: str) -> dict:
@@ -79,8 +96,7 @@ async def call_claude(
     newer Opus models reject them; prompt for style instead.
     """
     client = _get_anthropic_client()
-    response = await asyncio.to_thread(
-        client.messages.create,
+    response = await client.messages.create(
         model=model,
         max_tokens=max_tokens,
         system=system,
@@ -95,6 +111,14 @@ async def call_claude(
     return text
 
 
+async def call_claude_many(requests: list[dict]) -> list[str]:
+    """Run independent call_claude requests concurrently.
+
+    Each item holds call_claude keyword arguments; results keep input order.
+    """
+    return await asyncio.gather(*(call_claude(**req) for req in requests))
+
+
 async def call_claude_json(
     system: str,
     user_message: str,
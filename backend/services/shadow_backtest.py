@@ -6,167 +6,333 @@ Runs periodically and generates alerts with pre-drafted outreach emails.
 from __future__ import annotations
 
 import json
+import os
 import uuid
 import asyncio
+import threading
+from collections import defaultdict
 from datetime import datetime, date
+from itertools import groupby
+from operator import itemgetter
+from typing import NamedTuple, Optional
 
-from db.database import get_connection, dicts_from_rows
+from db.database import Row, get_reader, get_writer
 
 
 IDLE_CASH_THRESHOLD = 10000
 RRSP_DEADLINE_MONTH = 3  # March
+_OAS_THRESHOLD = 90997  # OAS recovery tax threshold
+_CESG_PER_CHILD = 2500  # annual RESP contribution that earns the full CESG
+_GRANT_PER_CHILD = 500  # 20% CESG match on that contribution
+_CASH_TYPES = frozenset({"checking", "savings"})
+# Accounts suggested for idle cash, in the order they're listed to the client
+_TAX_ADVANTAGED_TYPES = ("FHSA", "TFSA", "RRSP")
 
+# RRIF minimum withdrawal rate, keyed by the age each rate starts at
+_RRIF_MIN_PCT = {65: 0.04, 66: 0.0417, 67: 0.0435, 70: 0.05, 75: 0.0582, 80: 0.0682}
+_RRIF_MAX_AGE = 120
 
-async def run_shadow_backtest():
-    """Scan all clients for proactive opportunities. Returns list of new alerts."""
-    conn = get_connection()
-    clients = dicts_from_rows(conn.execute("SELECT * FROM clients").fetchall())
-    new_alerts = []
 
-    for client in clients:
-        client_id = client["id"]
-        name = client["name"]
-        first_name = name.split()[0]
-        goals = json.loads(client["goals"]) if client["goals"] else []
-        income = client.get("employment_income", 0)
-        dob = client.get("date_of_birth", "")
-        age = _estimate_age(dob)
-
-        accounts = dicts_from_rows(
-            conn.execute("SELECT * FROM accounts WHERE client_id = ?", (client_id,)).fetchall()
-        )
+def _rrif_rates_by_age() -> tuple[float, ...]:
+    rates = []
+    rate = 0.04
+    for age in range(_RRIF_MAX_AGE + 1):
+        rate = _RRIF_MIN_PCT.get(age, rate)
+        rates.append(rate)
+    return tuple(rates)
 
-        existing_alerts = dicts_from_rows(
-            conn.execute(
-                "SELECT alert_type FROM alerts WHERE client_id = ? AND status = 'pending'",
-                (client_id,),
-            ).fetchall()
-        )
-        existing_types = {a["alert_type"] for a in existing_alerts}
-
-        account_map = {a["type"]: a for a in accounts}
-
-        # 1. Idle cash check
-        for acct in accounts:
-            if acct["type"] in ("checking", "savings") and acct["balance"] > IDLE_CASH_THRESHOLD:
-                if "idle_cash" not in existing_types:
-                    tax_advantaged = []
-                    for t in ["FHSA", "TFSA", "RRSP"]:
-                        if t in account_map and account_map[t].get("contribution_room", 0) > 0:
-                            tax_advantaged.append(f"{t} (${account_map[t]['contribution_room']:,.0f} room)")
-
-                    if tax_advantaged:
-                        alert = _create_alert(
-                            client_id, "idle_cash",
-                            f"Idle cash in {acct['label'] or acct['type']}",
-                            f"{first_name} has ${acct['balance']:,.0f} in their {acct['label'] or acct['type']}. "
-                            f"Available tax-advantaged room: {', '.join(tax_advantaged)}.",
-                            _draft_idle_cash_email(first_name, name, acct["balance"], tax_advantaged),
-                        )
-                        new_alerts.append(alert)
-                        existing_types.add("idle_cash")
-
-        # 2. RRSP deadline approaching
-        today = date.today()
-        if today.month in (1, 2) and "RRSP" in account_map:
-            rrsp_room = account_map["RRSP"].get("contribution_room", 0)
-            if rrsp_room > 0 and "rrsp_deadline" not in existing_types:
-                alert = _create_alert(
-                    client_id, "rrsp_deadline",
-                    "RRSP deadline approaching",
-                    f"{first_name} has ${rrsp_room:,.0f} in unused RRSP room. "
-                    f"The contribution deadline for the current tax year is March 1.",
-                    _draft_rrsp_deadline_email(first_name, name, rrsp_room),
-                )
-                new_alerts.append(alert)
-
-        # 3. RESP CESG optimization
-        dependents = client.get("dependents", 0)
-        if dependents > 0 and "RESP" in account_map:
-            resp = account_map["RESP"]
-            if resp["balance"] < 2500 * dependents and "cesg_optimization" not in existing_types:
-                optimal = 2500 * dependents
-                cesg = 500 * dependents
-                alert = _create_alert(
-                    client_id, "cesg_optimization",
-                    f"RESP: maximize CESG for {'child' if dependents == 1 else f'{dependents} children'}",
-                    f"To get the maximum ${cesg:,} in CESG grants, {first_name} should contribute "
-                    f"${optimal:,} ($2,500/child) before December 31.",
-                    _draft_cesg_email(first_name, name, optimal, cesg, dependents),
-                )
-                new_alerts.append(alert)
-
-        # 4. OAS clawback risk for seniors
-        if age >= 65 and "oas_clawback" not in existing_types:
-            rrif = account_map.get("RRIF", {})
-            pension_income = income
-            if rrif:
-                min_pct = _get_rrif_min_pct(age)
-                pension_income += rrif.get("balance", 0) * min_pct
-
-            if pension_income > 90997:
-                alert = _create_alert(
-                    client_id, "oas_clawback",
-                    "OAS clawback risk",
-                    f"{first_name}'s estimated income (${pension_income:,.0f}) exceeds the OAS clawback threshold ($90,997). "
-                    f"Consider income splitting or TFSA strategies to reduce the clawback.",
-                    _draft_oas_email(first_name, name, pension_income),
-                )
-                new_alerts.append(alert)
-
-        # 5. RRIF minimum withdrawal
-        if age >= 65 and "RRIF" in account_map and "rrif_minimum" not in existing_types:
-            rrif = account_map["RRIF"]
-            min_pct = _get_rrif_min_pct(age)
-            min_withdrawal = rrif["balance"] * min_pct
-            alert = _create_alert(
-                client_id, "rrif_minimum",
-                "RRIF minimum withdrawal due",
-                f"{first_name}'s RRIF minimum withdrawal for this year: ${min_withdrawal:,.0f} "
-                f"({min_pct:.2%} of ${rrif['balance']:,.0f}). Must be withdrawn by December 31.",
-                None,
+
+# Dense per-age lookup so _get_rrif_min_pct is a single index
+_RRIF_MIN_PCT_BY_AGE = _rrif_rates_by_age()
+
+
+# A scan reads the pending alert types and inserts new alerts afterwards, so
+# overlapping scans would both raise the same alert; only one may run at a time.
+# The scheduler and POST /api/alerts/scan queue on the asyncio lock, so a waiting
+# scan doesn't hold a worker thread; the thread lock covers direct sync callers.
+_scan_async_lock = asyncio.Lock()
+_scan_lock = threading.Lock()
+
+
+async def run_shadow_backtest():
+    """Scan all clients for proactive opportunities. Returns list of new alerts.
+
+    The scan uses blocking sqlite3 calls, so it runs in a worker thread to keep
+    the event loop free for incoming requests.
+    """
+    async with _scan_async_lock:
+        return await asyncio.to_thread(run_shadow_backtest_sync)
+
+
+def run_shadow_backtest_sync():
+    with _scan_lock:
+        return _scan_all_clients()
+
+
+def _scan_all_clients():
+    with get_reader() as conn:
+        clients = conn.execute(
+            "SELECT id, name, employment_income, date_of_birth, dependents FROM clients"
+        ).fetchall()
+
+        # Every client is scanned, so load accounts and pending alert types for all
+        # of them up front instead of querying twice per client.
+        # Rows arrive grouped by client_id, so bucketing is a single groupby
+        # pass; rowid keeps each client's accounts in insertion order.
+        accounts_by_client = {
+            client_id: list(group)
+            for client_id, group in groupby(
+                conn.execute(
+                    "SELECT client_id, type, label, balance, contribution_room FROM accounts "
+                    "ORDER BY client_id, rowid"
+                ).fetchall(),
+                key=itemgetter("client_id"),
             )
-            new_alerts.append(alert)
+        }
+
+        pending_types_by_client = defaultdict(set)
+        for client_id, alert_type in conn.execute(
+            "SELECT client_id, alert_type FROM alerts WHERE status = 'pending'"
+        ):
+            pending_types_by_client[client_id].add(alert_type)
 
-    # Save new alerts
-    for alert in new_alerts:
-        conn.execute(
+    new_alerts = []
+    # Read the clock once per scan rather than per client and per alert.
+    today = date.today()
+    now_iso = datetime.now().isoformat()
+    for client in clients:
+        client_id = client["id"]
+        new_alerts.extend(_scan_client(
+            client, accounts_by_client.get(client_id, []), pending_types_by_client[client_id],
+            today, now_iso,
+        ))
+    if not new_alerts:
+        return new_alerts
+
+    # Draw entropy for all alert ids in one call instead of one uuid4() each.
+    entropy = os.urandom(16 * len(new_alerts))
+    for i, alert in enumerate(new_alerts):
+        alert["id"] = str(uuid.UUID(bytes=entropy[16 * i:16 * i + 16], version=4))
+
+    # Save new alerts in one BEGIN IMMEDIATE transaction on the shared writer
+    with get_writer() as conn:
+        conn.executemany(
             "INSERT INTO alerts (id, client_id, alert_type, title, description, drafted_action, status, created_at) VALUES (?,?,?,?,?,?,?,?)",
-            (alert["id"], alert["client_id"], alert["alert_type"], alert["title"],
-             alert["description"], json.dumps(alert.get("drafted_action", {})),
-             "pending", alert["created_at"]),
+            [
+                (alert["id"], alert["client_id"], alert["alert_type"], alert["title"],
+                 alert["description"], json.dumps(alert.get("drafted_action", {})),
+                 "pending", alert["created_at"])
+                for alert in new_alerts
+            ],
         )
-    conn.commit()
-    conn.close()
 
     return new_alerts
 
 
-def _create_alert(client_id: str, alert_type: str, title: str, description: str, drafted_action) -> dict:
+class _ScanContext(NamedTuple):
+    client: Row
+    first_name: str
+    age: int
+    accounts: list[Row]
+    account_map: dict[str, Row]
+    today: date
+    now_iso: str
+
+
+def _scan_client(
+    client: Row, accounts: list[Row], existing_types: set, today: date, now_iso: str,
+) -> list[dict]:
+    """Run every check against one client and return the alerts it raises."""
+    ctx = _ScanContext(
+        client=client,
+        first_name=client["name"].split()[0],
+        age=_estimate_age(client["date_of_birth"], today),
+        accounts=accounts,
+        account_map={a["type"]: a for a in accounts},
+        today=today,
+        now_iso=now_iso,
+    )
+    alerts = []
+    for alert_type, check in _CHECKS:
+        # At most one pending alert of each type per client
+        if alert_type in existing_types:
+            continue
+        alert = check(ctx)
+        if alert is not None:
+            alerts.append(alert)
+    return alerts
+
+
+def _check_idle_cash(ctx: _ScanContext) -> Optional[dict]:
+    # Flags the first cash account over the threshold
+    acct = next(
+        (a for a in ctx.accounts if a["type"] in _CASH_TYPES and a["balance"] > IDLE_CASH_THRESHOLD),
+        None,
+    )
+    if acct is None:
+        return None
+    tax_advantaged = []
+    for t in _TAX_ADVANTAGED_TYPES:
+        room = ctx.account_map[t]["contribution_room"] if t in ctx.account_map else 0
+        if room > 0:
+            tax_advantaged.append(f"{t} (${room:,.0f} room)")
+    if not tax_advantaged:
+        return None
+
+    first_name = ctx.first_name
+    acct_name = acct["label"] or acct["type"]
+    return _create_alert(
+        ctx.client["id"], "idle_cash",
+        f"Idle cash in {acct_name}",
+        f"{first_name} has ${acct['balance']:,.0f} in their {acct_name}. "
+        f"Available tax-advantaged room: {', '.join(tax_advantaged)}.",
+        _draft_idle_cash_email(first_name, ctx.client["name"], acct["balance"], tax_advantaged),
+        ctx.now_iso,
+    )
+
+
+def _check_rrsp_deadline(ctx: _ScanContext) -> Optional[dict]:
+    if ctx.today.month >= RRSP_DEADLINE_MONTH or "RRSP" not in ctx.account_map:
+        return None
+    rrsp_room = ctx.account_map["RRSP"]["contribution_room"]
+    if rrsp_room <= 0:
+        return None
+    return _create_alert(
+        ctx.client["id"], "rrsp_deadline",
+        "RRSP deadline approaching",
+        f"{ctx.first_name} has ${rrsp_room:,.0f} in unused RRSP room. "
+        f"The contribution deadline for the current tax year is March 1.",
+        _draft_rrsp_deadline_email(ctx.first_name, ctx.client["name"], rrsp_room),
+        ctx.now_iso,
+    )
+
+
+def _check_cesg(ctx: _ScanContext) -> Optional[dict]:
+    dependents = ctx.client["dependents"]
+    if dependents <= 0 or "RESP" not in ctx.account_map:
+        return None
+    optimal = _CESG_PER_CHILD * dependents
+    if ctx.account_map["RESP"]["balance"] >= optimal:
+        return None
+    cesg = _GRANT_PER_CHILD * dependents
+    return _create_alert(
+        ctx.client["id"], "cesg_optimization",
+        f"RESP: maximize CESG for {'child' if dependents == 1 else f'{dependents} children'}",
+        f"To get the maximum ${cesg:,} in CESG grants, {ctx.first_name} should contribute "
+        f"${optimal:,} (${_CESG_PER_CHILD:,}/child) before December 31.",
+        _draft_cesg_email(ctx.first_name, ctx.client["name"], optimal, cesg, dependents),
+        ctx.now_iso,
+    )
+
+
+def _check_oas_clawback(ctx: _ScanContext) -> Optional[dict]:
+    if ctx.age < 65:
+        return None
+    pension_income = ctx.client["employment_income"]
+    rrif = ctx.account_map.get("RRIF")
+    if rrif is not None:
+        pension_income += rrif["balance"] * _get_rrif_min_pct(ctx.age)
+    if pension_income <= _OAS_THRESHOLD:
+        return None
+    return _create_alert(
+        ctx.client["id"], "oas_clawback",
+        "OAS clawback risk",
+        f"{ctx.first_name}'s estimated income (${pension_income:,.0f}) exceeds the OAS clawback threshold (${_OAS_THRESHOLD:,}). "
+        f"Consider income splitting or TFSA strategies to reduce the clawback.",
+        _draft_oas_email(ctx.first_name, ctx.client["name"], pension_income),
+        ctx.now_iso,
+    )
+
+
+def _check_rrif_minimum(ctx: _ScanContext) -> Optional[dict]:
+    if ctx.age < 65 or "RRIF" not in ctx.account_map:
+        return None
+    rrif = ctx.account_map["RRIF"]
+    min_pct = _get_rrif_min_pct(ctx.age)
+    min_withdrawal = rrif["balance"] * min_pct
+    return _create_alert(
+        ctx.client["id"], "rrif_minimum",
+        "RRIF minimum withdrawal due",
+        f"{ctx.first_name}'s RRIF minimum withdrawal for this year: ${min_withdrawal:,.0f} "
+        f"({min_pct:.2%} of ${rrif['balance']:,.0f}). Must be withdrawn by December 31.",
+        None,
+        ctx.now_iso,
+    )
+
+
+# (alert_type, check) pairs run in order for every client. A check returns the
+# alert to raise, or None; it's skipped when that type is already pending.
+_CHECKS = (
+    ("idle_cash", _check_idle_cash),
+    ("rrsp_deadline", _check_rrsp_deadline),
+    ("cesg_optimization", _check_cesg),
+    ("oas_clawback", _check_oas_clawback),
+    ("rrif_minimum", _check_rrif_minimum),
+)
+
+
+def _create_alert(
+    client_id: str, alert_type: str, title: str, description: str, drafted_action, created_at: str,
+) -> dict:
     return {
-        "id": str(uuid.uuid4()),
+        "id": None,  # assigned in bulk once the scan finishes
         "client_id": client_id,
         "alert_type": alert_type,
         "title": title,
         "description": description,
         "drafted_action": drafted_action or {},
         "status": "pending",
-        "created_at": datetime.now().isoformat(),
+        "created_at": created_at,
     }
 
 
+# Outreach email bodies, filled in with str.format_map
+_IDLE_CASH_EMAIL = (
+    "Hi {first_name},\n\n"
+    "I noticed you have about ${amount:,.0f} in your chequing account. "
+    "You still have room in some tax-advantaged accounts that could help your money grow faster:\n\n"
+    "{bullets}\n"
+    "Would you like to discuss moving some of those funds? It could make a meaningful difference come tax time.\n\n"
+    "Best,\nAlex"
+)
+
+_RRSP_DEADLINE_EMAIL = (
+    "Hi {first_name},\n\n"
+    "Quick reminder: the RRSP contribution deadline for this tax year is March 1. "
+    "You have ${room:,.0f} in available room.\n\n"
+    "Contributing before the deadline means you can claim the deduction on this year's taxes. "
+    "Want me to put together a plan?\n\n"
+    "Best,\nAlex"
+)
+
+_CESG_EMAIL = (
+    "Hi {first_name},\n\n"
+    "I wanted to flag something before year-end: if you contribute ${contribution:,} to the RESP "
+    "(${per_child:,} per child), the government matches 20% through the CESG program. "
+    "That's ${cesg:,} in free grants.\n\n"
+    "This is one of the best guaranteed returns available. Would you like to set this up?\n\n"
+    "Best,\nAlex"
+)
+
+_OAS_EMAIL = (
+    "Hi {first_name},\n\n"
+    "I've been reviewing your income situation and wanted to flag something: "
+    "your estimated income of ${income:,.0f} puts you above the OAS clawback threshold (${threshold:,}). "
+    "This means some of your OAS benefits may be reduced.\n\n"
+    "There are strategies we can explore — like pension income splitting with your spouse "
+    "or using your TFSA more strategically. Want to discuss?\n\n"
+    "Best,\nAlex"
+)
+
+
 def _draft_idle_cash_email(first_name, full_name, amount, tax_advantaged):
+    bullets = "".join(f"  - {t}\n" for t in tax_advantaged)
     return {
         "type": "email_draft",
         "to": full_name,
         "subject": "Quick thought on your savings",
-        "body": (
-            f"Hi {first_name},\n\n"
-            f"I noticed you have about ${amount:,.0f} in your chequing account. "
-            f"You still have room in some tax-advantaged accounts that could help your money grow faster:\n\n"
-            f"{''.join(f'  - {t}' + chr(10) for t in tax_advantaged)}\n"
-            f"Would you like to discuss moving some of those funds? It could make a meaningful difference come tax time.\n\n"
-            f"Best,\nAlex"
+        "body": _IDLE_CASH_EMAIL.format_map(
+            {"first_name": first_name, "amount": amount, "bullets": bullets}
         ),
     }
 
@@ -176,14 +342,7 @@ def _draft_rrsp_deadline_email(first_name, full_name, room):
         "type": "email_draft",
         "to": full_name,
         "subject": "RRSP deadline reminder - March 1",
-        "body": (
-            f"Hi {first_name},\n\n"
-            f"Quick reminder: the RRSP contribution deadline for this tax year is March 1. "
-            f"You have ${room:,.0f} in available room.\n\n"
-            f"Contributing before the deadline means you can claim the deduction on this year's taxes. "
-            f"Want me to put together a plan?\n\n"
-            f"Best,\nAlex"
-        ),
+        "body": _RRSP_DEADLINE_EMAIL.format_map({"first_name": first_name, "room": room}),
     }
 
 
@@ -192,13 +351,8 @@ def _draft_cesg_email(first_name, full_name, contribution, cesg, children):
         "type": "email_draft",
         "to": full_name,
         "subject": "Free money for education savings",
-        "body": (
-            f"Hi {first_name},\n\n"
-            f"I wanted to flag something before year-end: if you contribute ${contribution:,} to the RESP "
-            f"($2,500 per child), the government matches 20% through the CESG program. "
-            f"That's ${cesg:,} in free grants.\n\n"
-            f"This is one of the best guaranteed returns available. Would you like to set this up?\n\n"
-            f"Best,\nAlex"
+        "body": _CESG_EMAIL.format_map(
+            {"first_name": first_name, "contribution": contribution, "cesg": cesg, "per_child": _CESG_PER_CHILD}
         ),
     }
 
@@ -208,33 +362,24 @@ def _draft_oas_email(first_name, full_name, income):
         "type": "email_draft",
         "to": full_name,
         "subject": "Strategy to protect your OAS benefits",
-        "body": (
-            f"Hi {first_name},\n\n"
-            f"I've been reviewing your income situation and wanted to flag something: "
-            f"your estimated income of ${income:,.0f} puts you above the OAS clawback threshold ($90,997). "
-            f"This means some of your OAS benefits may be reduced.\n\n"
-            f"There are strategies we can explore — like pension income splitting with your spouse "
-            f"or using your TFSA more strategically. Want to discuss?\n\n"
-            f"Best,\nAlex"
+        "body": _OAS_EMAIL.format_map(
+            {"first_name": first_name, "income": income, "threshold": _OAS_THRESHOLD}
         ),
     }
 
 
-def _estimate_age(dob: str) -> int:
+def _estimate_age(dob: str, today: date) -> int:
     if not dob:
         return 0
     try:
         parts = dob.split("-")
         birth = date(int(parts[0]), int(parts[1]), int(parts[2]))
-        today = date.today()
         return today.year - birth.year - ((today.month, today.day) < (birth.month, birth.day))
     except Exception:
         return 0
 
 
 def _get_rrif_min_pct(age: int) -> float:
-    table = {65: 0.04, 66: 0.0417, 67: 0.0435, 70: 0.05, 75: 0.0582, 80: 0.0682}
-    for threshold_age in sorted(table.keys(), reverse=True):
-        if age >= threshold_age:
-            return table[threshold_age]
-    return 0.04
+    if age < 0:
+        return 0.04
+    return _RRIF_MIN_PCT_BY_AGE[min(age, _RRIF_MAX_AGE)]
@@ -1,10 +1,11 @@
-"""Production start script. Installs dependencies and launches the server."""
-import subprocess
+"""Production start script. Launches the server.
+
+Dependencies are installed at build time: Nixpacks runs pip install on
+requirements.txt when it builds the image.
+"""
 import sys
 import os
 
-subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt", "-q"])
-
 volume_path = os.environ.get("RAILWAY_VOLUME_MOUNT_PATH", "/app/data")
 os.environ.setdefault("DB_DIR", volume_path)
 
@@ -5,6 +5,7 @@ import { useAppStore } from "@/lib/store";
 import type { AgentTask, ConversationMessage, TriTieredOutput, RagEntry } from "@/lib/types";
 
 const WS_URL = process.env.NEXT_PUBLIC_WS_URL || "ws://localhost:8000/ws";
+const decoder = new TextDecoder();
 
 export function useWebSocket() {
   const wsRef = useRef<WebSocket | null>(null);
@@ -30,6 +31,7 @@ export function useWebSocket() {
     if (wsRef.current?.readyState === WebSocket.OPEN) return;
 
     const ws = new WebSocket(WS_URL);
+    ws.binaryType = "arraybuffer";
     wsRef.current = ws;
 
     ws.onopen = () => {
@@ -51,7 +53,9 @@ export function useWebSocket() {
 
     ws.onmessage = (event) => {
       try {
-        const msg = JSON.parse(event.data);
+        // The server sends pre-encoded JSON as binary frames.
+        const raw = typeof event.data === "string" ? event.data : decoder.decode(event.data);
+        const msg = JSON.parse(raw);
         handleMessage(msg);
       } catch {
         // ignore malformed messages
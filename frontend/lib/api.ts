@@ -1,4 +1,6 @@
 const API_BASE = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
+// Largest page /api/alerts will return.
+const ALERTS_PAGE_SIZE = 500;
 
 async function fetchJSON<T>(path: string, options?: RequestInit): Promise<T> {
   const res = await fetch(`${API_BASE}${path}`, {
@@ -17,7 +19,17 @@ export const api = {
   clearClientChat: (id: string) => fetchJSON<Record<string, unknown>>(`/api/clients/${id}/chat`, { method: "DELETE" }),
   completeRequest: (clientId: string, messageId: string) =>
     fetchJSON<Record<string, unknown>>(`/api/clients/${clientId}/requests/${messageId}`, { method: "PATCH" }),
-  getAlerts: (status = "pending") => fetchJSON<Record<string, unknown>[]>(`/api/alerts?status=${status}`),
+  getAlerts: async (status = "pending") => {
+    // The endpoint returns one page at a time; keep fetching until a short page.
+    const alerts: Record<string, unknown>[] = [];
+    for (let offset = 0; ; offset += ALERTS_PAGE_SIZE) {
+      const page = await fetchJSON<Record<string, unknown>[]>(
+        `/api/alerts?status=${status}&limit=${ALERTS_PAGE_SIZE}&offset=${offset}`
+      );
+      alerts.push(...page);
+      if (page.length < ALERTS_PAGE_SIZE) return alerts;
+    }
+  },
   actOnTask: (taskId: string, action: string, note = "") =>
     fetchJSON<Record<string, unknown>>(`/api/agents/tasks/${taskId}/action`, {
       method: "POST",